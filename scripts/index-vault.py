@@ -33,46 +33,553 @@ Usage:
 
   # Show index stats
   python3 scripts/index-vault.py stats
+
+  # Fold journaled updates into the main index file
+  python3 scripts/index-vault.py compact
+
+  # Keep the index loaded in a daemon on memory/meta/index.sock; other
+  # commands run inside it while it is up (AGENCY_INDEX_DAEMON=1 starts
+  # it on demand)
+  python3 scripts/index-vault.py serve
 """
 
-import glob
+import contextlib
 import hashlib
+import heapq
+import io
+import itertools
 import json
 import os
+import pickle
+import re
+import shutil
+import signal
+import socket
+import socketserver
+import struct
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # All paths are relative to the project root (where memory/ lives),
 # not relative to this script or the plugin directory.
 VAULT_DIR = 'memory'
 INDEX_FILE = os.path.join(VAULT_DIR, 'meta', 'semantic-index.json')
-MISS_LOG_FILE = os.path.join(VAULT_DIR, 'meta', 'miss-log.json')
+# Process umask, read once so atomic writes can apply the usual file mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Bumped when the stored format changes. Version 1 used truncated SHA-256;
+# version 2 stored paths instead of slots in the inverted index; version 3
+# split terms on whitespace only.
+INDEX_VERSION = 4
+# Parsed copy of INDEX_FILE, valid while the JSON's mtime and size match
+INDEX_CACHE_FILE = INDEX_FILE + '.pkl'
+# Bumped when the in-memory index layout changes without INDEX_VERSION
+INDEX_CACHE_FORMAT = 3
+# Entries updated since the index was last compacted, one JSON object per line
+INDEX_JOURNAL_FILE = os.path.join(VAULT_DIR, 'meta', 'semantic-index.journal.ndjson')
+# search-json payloads, keyed by query and index stamp; wiped on every write
+SEARCH_CACHE_DIR = os.path.join(VAULT_DIR, 'meta', 'search-cache')
+# Least recently used payloads beyond this many are evicted
+SEARCH_CACHE_MAX_ENTRIES = 256
+# Unix socket of the `serve` daemon. While it is listening, CLI commands
+# run inside the daemon; set AGENCY_INDEX_DAEMON=1 to start it on demand.
+INDEX_SOCKET = os.path.join(VAULT_DIR, 'meta', 'index.sock')
+DAEMON_ENV = 'AGENCY_INDEX_DAEMON'
+# One JSON object per line, appended by `miss`
+MISS_LOG_FILE = os.path.join(VAULT_DIR, 'meta', 'miss-log.ndjson')
+# Whole-array format used before the NDJSON log; converted on first use
+LEGACY_MISS_LOG_FILE = os.path.join(VAULT_DIR, 'meta', 'miss-log.json')
+
+
+def content_hash(data):
+    """Short BLAKE2b hash of a file's raw bytes for change detection."""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def content_hash_file(fpath):
+    """content_hash() of a file, streamed in 64 KiB chunks."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(fpath, 'rb', buffering=0) as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _dumps(obj, indent=True):
+    """Encode obj as JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _loads(data):
+    """Decode JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _atomic_write(path, data):
+    """Write bytes to path via a synced temp file and os.replace().
+
+    Readers see either the old file or the new one, never a partial write.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path),
+                               prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; give the file the mode open() would have
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _file_stamp(path):
+    """Return (mtime_ns, size) of path, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _index_stamp():
+    """Return the stamps of the index and its journal, or None if neither exists."""
+    stamp = (_file_stamp(INDEX_FILE), _file_stamp(INDEX_JOURNAL_FILE))
+    return None if stamp == (None, None) else stamp
+
+
+def _read_index_cache(stamp):
+    """Return the cached parsed base index if it matches stamp, else None."""
+    try:
+        with open(INDEX_CACHE_FILE, 'rb') as f:
+            cache_format, cached_stamp, index = pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    if cache_format != INDEX_CACHE_FORMAT or cached_stamp != stamp:
+        return None
+    return index
+
+
+def _write_index_cache(index, stamp):
+    """Store the parsed base index next to the JSON. Failure is not an error.
+
+    stamp is the base file's stamp; the journal is never folded into the
+    cache, so appends leave it valid.
+    """
+    try:
+        _atomic_write(INDEX_CACHE_FILE,
+                      pickle.dumps((INDEX_CACHE_FORMAT, stamp, index), protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
+
+
+def _replay_journal(index):
+    """Apply entries appended since the last compaction, in order."""
+    try:
+        with open(INDEX_JOURNAL_FILE, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return
+    for line in lines:
+        try:
+            entry = _loads(line)
+        except json.JSONDecodeError:
+            # A torn final line from an interrupted append
+            continue
+        # Re-derive so lines written by an older version match the base
+        set_entry(index, derive_terms(entry))
 
 
-def content_hash(text):
-    """Short SHA-256 hash for change detection."""
-    return hashlib.sha256(text.encode()).hexdigest()[:16]
+# The index this process last loaded or wrote, with the stamp it matches.
+# Lets a long-lived process (see cmd_serve) skip even the pickle load.
+_loaded = {'stamp': None, 'index': None}
+
+
+def _remember_index(index, stamp):
+    """Record index as this process's current copy for stamp."""
+    _loaded['stamp'] = stamp
+    _loaded['index'] = index
 
 
 def load_index():
-    """Load index from disk, or return empty structure."""
+    """Load index from disk, or return empty structure.
+
+    The base JSON file is combined with entries appended to the journal
+    since it was last compacted. A pickled copy of the parsed base is
+    reused while the base file is unchanged, which skips JSON parsing and
+    migration on repeat calls; the small journal is replayed on top.
+    """
+    stamp = _index_stamp()
+    if stamp is not None and _loaded['stamp'] == stamp:
+        return _loaded['index']
+    index = _read_index(stamp)
+    if stamp is not None:
+        _remember_index(index, stamp)
+    return index
+
+
+def _read_index(stamp):
+    """Load the base index from the pickled cache or the JSON, then replay."""
+    index = _read_base_index(stamp[0] if stamp is not None else None)
+    _replay_journal(index)
+    return index
+
+
+def _read_base_index(base_stamp):
+    """Load and migrate the base index file, without the journal."""
+    if base_stamp is not None:
+        index = _read_index_cache(base_stamp)
+        if index is not None and index.get('version') == INDEX_VERSION:
+            return index
     try:
-        with open(INDEX_FILE, 'r') as f:
-            return json.load(f)
+        with open(INDEX_FILE, 'rb') as f:
+            index = _loads(f.read())
     except (FileNotFoundError, json.JSONDecodeError):
-        return {'version': 1, 'entries': {}}
+        index = {'version': INDEX_VERSION, 'entries': {}}
+    version = index.get('version', 1)
+    if version < 2:
+        # Old hashes cannot match; drop the stat fields so scan rehashes
+        # every file and reports it for indexing.
+        for entry in index['entries'].values():
+            entry.pop('mtime_ns', None)
+            entry.pop('size', None)
+    if version < 4:
+        # Term fields were missing or tokenized differently
+        for entry in index['entries'].values():
+            derive_terms(entry)
+    index['version'] = INDEX_VERSION
+    _intern_index(index)
+    # Postings are derived from the entries on every JSON load, so a file
+    # edited by hand (e.g. to drop stale entries) can never disagree with
+    # them; the pickled cache is what keeps repeat loads fast.
+    build_inverted(index)
+    if base_stamp is not None:
+        _write_index_cache(index, base_stamp)
+    return index
+
+
+def _search_cache_path(query, top_n, stamp):
+    """Path of the cached search-json payload for a query at an index stamp."""
+    key = hashlib.blake2b(repr((INDEX_VERSION, query, top_n, stamp)).encode(),
+                          digest_size=16).hexdigest()
+    return os.path.join(SEARCH_CACHE_DIR, key + '.json')
+
+
+def _write_search_cache(cache_path, payload):
+    """Store a search-json payload and evict the least recently used extras.
+
+    The payload is disposable, so it is renamed into place without an
+    fsync. Hits refresh a file's mtime, which orders the eviction.
+    """
+    try:
+        os.makedirs(SEARCH_CACHE_DIR, exist_ok=True)
+        tmp = f'{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, cache_path)
+        with os.scandir(SEARCH_CACHE_DIR) as it:
+            cached = [e for e in it if e.name.endswith('.json')]
+        if len(cached) > SEARCH_CACHE_MAX_ENTRIES:
+            cached.sort(key=lambda e: e.stat().st_mtime_ns)
+            for e in cached[:len(cached) - SEARCH_CACHE_MAX_ENTRIES]:
+                os.remove(e.path)
+    except OSError:
+        pass
+
+
+def _clear_search_cache():
+    """Drop cached search results after the index changes."""
+    shutil.rmtree(SEARCH_CACHE_DIR, ignore_errors=True)
+
+
+# Derived from the entries on load (see build_inverted); never written to
+# the JSON
+_IN_MEMORY_KEYS = ('paths', 'path_slots', 'inverted')
 
 
 def save_index(index):
-    """Write index to disk, creating directories as needed."""
+    """Atomically write the full index and truncate the journal it absorbs."""
     os.makedirs(os.path.dirname(INDEX_FILE), exist_ok=True)
-    with open(INDEX_FILE, 'w') as f:
-        json.dump(index, f, indent=2)
+    _atomic_write(INDEX_FILE, _dumps(
+        {k: v for k, v in index.items() if k not in _IN_MEMORY_KEYS}))
+    _clear_search_cache()
+    try:
+        os.remove(INDEX_JOURNAL_FILE)
+    except FileNotFoundError:
+        pass
+    stamp = _index_stamp()
+    _write_index_cache(index, stamp[0])
+    _remember_index(index, stamp)
+
+
+def _append_record(path, obj):
+    """Append obj as one JSON line to an NDJSON file; return the new size.
+
+    A torn final line left by an interrupted append is kept on its own
+    line, so readers skip it without losing this record.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    line = _dumps(obj, indent=False) + b'\n'
+    with open(path, 'a+b') as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                line = b'\n' + line
+        f.write(line)
+        return f.tell()
+
+
+def append_entry(index, entry):
+    """Persist one updated entry by appending it to the journal.
+
+    index must already contain entry (see set_entry). The journal is
+    compacted into the base file once it grows past a tenth of its size.
+    """
+    journal_size = _append_record(INDEX_JOURNAL_FILE, entry)
+    _clear_search_cache()
+    base = _file_stamp(INDEX_FILE)
+    if base is None or journal_size > base[1] // 10:
+        save_index(index)
+    else:
+        # The pickled base is still valid; only this process's copy moves on
+        _remember_index(index, _index_stamp())
+
+
+def _scandir_md(path):
+    """Recursively yield DirEntry objects for markdown files under path.
+
+    Uses the cached DirEntry type info instead of a stat() per path.
+    Symlinks and dotfiles are skipped, matching the old glob behavior
+    for hidden names.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.startswith('.') or entry.is_symlink():
+                continue
+            if entry.is_file():
+                if entry.name.endswith('.md'):
+                    yield entry
+            elif entry.is_dir():
+                yield from _scandir_md(entry.path)
+
+
+# Below this many files, starting a thread pool costs more than it saves
+HASH_POOL_MIN_FILES = 8
+
+
+def hash_files(paths):
+    """Hash many files concurrently, yielding (path, hash) in order.
+
+    File reads and hashlib both release the GIL, so a thread pool hashes
+    on several cores while overlapping storage latency across files.
+    """
+    if len(paths) < HASH_POOL_MIN_FILES:
+        for fpath in paths:
+            yield fpath, content_hash_file(fpath)
+        return
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as ex:
+        yield from zip(paths, ex.map(content_hash_file, paths))
+
+
+def head_lines(fpath, n=5):
+    """Return the first n lines of a file without reading the rest."""
+    with open(fpath, 'r') as f:
+        return [line.rstrip('\n') for line in itertools.islice(f, n)]
+
+
+def vault_entries():
+    """Find all markdown files in the vault as DirEntry objects, by path."""
+    if not os.path.isdir(VAULT_DIR):
+        return []
+    return sorted(_scandir_md(VAULT_DIR), key=lambda e: e.path)
 
 
 def vault_files():
     """Find all markdown files in the vault."""
-    return sorted(glob.glob(os.path.join(VAULT_DIR, '**', '*.md'), recursive=True))
+    return [e.path for e in vault_entries()]
+
+
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Split text into casefolded word tokens, dropping punctuation."""
+    return _TOKEN.findall(text.casefold())
+
+
+def _expand_keywords(keywords):
+    """Expand compound keywords into individual terms for partial matching.
+
+    "Borden twins" -> {"borden twins", "borden", "twins"}
+    """
+    terms = set()
+    for k in keywords:
+        kl = k.casefold()
+        terms.add(kl)
+        terms.update(tokenize(kl))
+    return terms
+
+
+def derive_terms(entry):
+    """Store the normalized search terms for an entry on the entry itself.
+
+    Normalizing once at update time keeps lower/split/set work out of
+    every query.
+    """
+    entry['keyword_terms'] = sorted(_expand_keywords(entry.get('keywords', [])))
+    entry['summary_terms'] = sorted(set(tokenize(entry.get('summary', ''))))
+    return entry
+
+
+_INTERNED_FIELDS = ('keywords', 'related', 'keyword_terms', 'summary_terms')
+
+
+def _intern_entry(entry):
+    """Share one str object per distinct keyword, term and path.
+
+    The same keywords recur across many entries; interning shrinks the
+    loaded index and lets set and dict lookups match on identity.
+    """
+    entry['source_path'] = sys.intern(entry['source_path'])
+    for field in _INTERNED_FIELDS:
+        if field in entry:
+            entry[field] = [sys.intern(v) for v in entry[field]]
+
+
+def _intern_index(index):
+    """Intern the strings of a freshly parsed index (see _intern_entry).
+
+    Run before build_inverted(), so the paths column and posting terms
+    reuse the interned strings.
+    """
+    for entry in index['entries'].values():
+        _intern_entry(entry)
+    index['entries'] = {sys.intern(p): e for p, e in index['entries'].items()}
+
+
+def _entry_terms(entry):
+    """Return (keyword terms, summary terms) that an entry is searchable by."""
+    if entry is None:
+        return set(), set()
+    return set(entry['keyword_terms']), set(entry['summary_terms'])
+
+
+def build_inverted(index):
+    """Build the paths column and term -> [slot] postings from the entries.
+
+    Postings hold integer slots into index['paths'] rather than repeating
+    each path string under every one of its terms. index['path_slots']
+    maps each path back to its slot. None of these are saved to the JSON.
+    """
+    index['paths'] = list(index['entries'])
+    index['path_slots'] = {p: slot for slot, p in enumerate(index['paths'])}
+    inverted = index['inverted'] = {'kw': {}, 'sum': {}}
+    for slot, entry in enumerate(index['entries'].values()):
+        kw_terms, sum_terms = _entry_terms(entry)
+        for t in kw_terms:
+            inverted['kw'].setdefault(t, []).append(slot)
+        for t in sum_terms:
+            inverted['sum'].setdefault(t, []).append(slot)
+
+
+def patch_inverted(inverted, slot, old_entry, new_entry):
+    """Update postings for slot after its entry changed from old to new."""
+    old_terms = _entry_terms(old_entry)
+    new_terms = _entry_terms(new_entry)
+    for postings, old, new in zip((inverted['kw'], inverted['sum']), old_terms, new_terms):
+        for t in old - new:
+            slots = postings.get(t)
+            if slots and slot in slots:
+                slots.remove(slot)
+                if not slots:
+                    del postings[t]
+        for t in new - old:
+            postings.setdefault(t, []).append(slot)
+
+
+def set_entry(index, entry):
+    """Insert or replace an entry, keeping the inverted index in step."""
+    fpath = entry['source_path']
+    old_entry = index['entries'].get(fpath)
+    if old_entry is None:
+        slot = index['path_slots'][fpath] = len(index['paths'])
+        index['paths'].append(fpath)
+    else:
+        slot = index['path_slots'][fpath]
+    _intern_entry(entry)
+    patch_inverted(index['inverted'], slot, old_entry, entry)
+    index['entries'][fpath] = entry
+    _rank_memo['results'] = OrderedDict()
+
+
+# Ranked results for the index object they were computed on, so a
+# long-lived process answers repeated queries without rescoring.
+# set_entry() clears it; beyond RANK_MEMO_MAX_ENTRIES queries the least
+# recently used are dropped.
+RANK_MEMO_MAX_ENTRIES = 256
+_rank_memo = {'index': None, 'results': OrderedDict()}
+
+
+def rank(index, query_terms, top_n=10):
+    """Score entries against query terms via the inverted index.
+
+    Keywords match at full weight, summary terms at half weight.
+    Returns the top_n [(score, path, entry)] best first; only those are
+    ordered, the rest of the matches are never sorted.
+    """
+    if _rank_memo['index'] is not index:
+        _rank_memo['index'] = index
+        _rank_memo['results'] = OrderedDict()
+    memo = _rank_memo['results']
+    key = (frozenset(query_terms), top_n)
+    results = memo.get(key)
+    if results is None:
+        results = memo[key] = _rank(index, query_terms, top_n)
+        if len(memo) > RANK_MEMO_MAX_ENTRIES:
+            memo.popitem(last=False)
+    else:
+        memo.move_to_end(key)
+    return results
+
+
+def _rank(index, query_terms, top_n):
+    """Uncached rank()."""
+    inverted = index['inverted']
+    # Counter() consumes the chained postings in C, so per-path counting
+    # adds no Python bytecode per posting.
+    kw_hits = Counter(itertools.chain.from_iterable(
+        inverted['kw'].get(t, ()) for t in query_terms))
+    sum_hits = Counter(itertools.chain.from_iterable(
+        inverted['sum'].get(t, ()) for t in query_terms))
+    paths = index['paths']
+    scores = {paths[i]: float(n) for i, n in kw_hits.items()}
+    for i, n in sum_hits.items():
+        p = paths[i]
+        scores[p] = scores.get(p, 0.0) + 0.5 * n
+    entries = index['entries']
+    top = heapq.nsmallest(top_n, scores.items(), key=lambda x: (-x[1], x[0]))
+    return [(score, p, entries[p]) for p, score in top]
 
 
 # ---------------------------------------------------------------------------
@@ -82,24 +589,42 @@ def vault_files():
 def cmd_scan():
     """Find files needing indexing. Prints info for a subagent to process."""
     index = load_index()
-    files = vault_files()
     needs_indexing = []
 
-    for fpath in files:
-        with open(fpath, 'r') as f:
-            text = f.read()
-        h = content_hash(text)
+    # Files whose mtime and size match the index entry are unchanged;
+    # only the rest are read and hashed.
+    candidates = []
+    stats = {}
+    for e in vault_entries():
+        st = e.stat(follow_symlinks=False)
+        entry = index['entries'].get(e.path)
+        if (entry and entry.get('mtime_ns') == st.st_mtime_ns
+                and entry.get('size') == st.st_size):
+            continue
+        candidates.append(e.path)
+        stats[e.path] = st
+
+    refreshed = 0
+    for fpath, h in hash_files(candidates):
         entry = index['entries'].get(fpath)
         if entry and entry.get('content_hash') == h:
+            # Touched but unchanged (checkout, clone, restore): record the
+            # new stat so later scans skip the file again
+            entry['mtime_ns'] = stats[fpath].st_mtime_ns
+            entry['size'] = stats[fpath].st_size
+            refreshed += 1
             continue
         needs_indexing.append(fpath)
         print(f'NEEDS_INDEX: {fpath}')
         print(f'  hash: {h}')
         # Preview first 5 lines for context
-        for line in text.split('\n')[:5]:
+        for line in head_lines(fpath):
             print(f'  | {line}')
         print()
 
+    if refreshed:
+        save_index(index)
+
     if not needs_indexing:
         print('All files indexed and up to date.')
     else:
@@ -113,10 +638,10 @@ def cmd_file(fpath):
     if not os.path.isfile(fpath):
         print(f'Error: file not found: {fpath}')
         sys.exit(1)
-    with open(fpath, 'r') as f:
-        text = f.read()
-    print(text)
-    print(f'\nContent hash: {content_hash(text)}')
+    with open(fpath, 'rb') as f:
+        data = f.read()
+    print(data.decode())
+    print(f'\nContent hash: {content_hash(data)}')
 
 
 def cmd_update(fpath, summary, keywords, related=None):
@@ -125,61 +650,44 @@ def cmd_update(fpath, summary, keywords, related=None):
         print(f'Error: file not found: {fpath}')
         sys.exit(1)
     index = load_index()
-    with open(fpath, 'r') as f:
-        text = f.read()
-    index['entries'][fpath] = {
+    st = os.stat(fpath)
+    entry = {
         'source_path': fpath,
-        'content_hash': content_hash(text),
+        'content_hash': content_hash_file(fpath),
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
         'summary': summary,
         'keywords': keywords,
         'related': related or [],
     }
-    save_index(index)
+    derive_terms(entry)
+    set_entry(index, entry)
+    append_entry(index, entry)
     print(f'Indexed: {fpath} ({len(keywords)} keywords)')
 
 
-def _expand_keywords(keywords):
-    """Expand compound keywords into individual terms for partial matching.
-
-    "Borden twins" -> {"borden twins", "borden", "twins"}
-    """
-    terms = set()
-    for k in keywords:
-        kl = k.lower()
-        terms.add(kl)
-        parts = kl.split()
-        if len(parts) > 1:
-            terms.update(parts)
-    return terms
+def cmd_compact():
+    """Fold journaled updates into the base index file."""
+    index = load_index()
+    save_index(index)
+    print(f'Compacted index: {len(index["entries"])} entries')
 
 
 def cmd_search(query):
     """Search by keyword overlap with query terms. Prints ranked results."""
     index = load_index()
-    query_terms = set(query.lower().split())
-    results = []
-
-    for fpath, entry in index['entries'].items():
-        entry_terms = _expand_keywords(entry.get('keywords', []))
-        summary_terms = set(entry.get('summary', '').lower().split())
-        # Keywords match at full weight, summary terms at half weight
-        kw_overlap = len(query_terms & entry_terms)
-        summary_overlap = len(query_terms & summary_terms) * 0.5
-        score = kw_overlap + summary_overlap
-        if score > 0:
-            results.append((score, fpath, entry))
-
-    results.sort(key=lambda x: -x[0])
+    query_terms = set(tokenize(query))
+    results = rank(index, query_terms)
 
     if not results:
         print(f'No matches for: {query}')
         return []
 
     print(f'Results for: {query}\n')
-    for score, fpath, entry in results[:10]:
+    for score, fpath, entry in results:
         print(f'  [{score:.1f}] {fpath}')
         print(f'        {entry.get("summary", "")[:100]}')
-        matched = query_terms & _expand_keywords(entry.get('keywords', []))
+        matched = query_terms.intersection(entry['keyword_terms'])
         if matched:
             print(f'        matched keywords: {", ".join(sorted(matched))}')
         print()
@@ -188,25 +696,33 @@ def cmd_search(query):
 
 
 def cmd_search_json(query, top_n=10):
-    """Search and return structured JSON for subagent reranking."""
-    index = load_index()
-    query_terms = set(query.lower().split())
-    results = []
+    """Search and return structured JSON for subagent reranking.
 
-    for fpath, entry in index['entries'].items():
-        entry_terms = _expand_keywords(entry.get('keywords', []))
-        summary_terms = set(entry.get('summary', '').lower().split())
-        kw_overlap = len(query_terms & entry_terms)
-        summary_overlap = len(query_terms & summary_terms) * 0.5
-        score = kw_overlap + summary_overlap
-        if score > 0:
-            results.append((score, fpath, entry))
+    Repeated queries against an unchanged index print the cached payload
+    and return None without loading the index.
+    """
+    stamp = _index_stamp()
+    cache_path = _search_cache_path(query, top_n, stamp)
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = f.read()
+    except FileNotFoundError:
+        cached = None
+    if cached is not None:
+        sys.stdout.write(cached.decode())
+        # Mark as recently used; a concurrent write may already have
+        # cleared the cache, which is fine.
+        with contextlib.suppress(OSError):
+            os.utime(cache_path)
+        return None
 
-    results.sort(key=lambda x: -x[0])
+    index = load_index()
+    query_terms = set(tokenize(query))
+    results = rank(index, query_terms, top_n)
 
     candidates = []
-    for score, fpath, entry in results[:top_n]:
-        matched_kw = sorted(query_terms & _expand_keywords(entry.get('keywords', [])))
+    for score, fpath, entry in results:
+        matched_kw = sorted(query_terms.intersection(entry['keyword_terms']))
         candidates.append({
             'path': fpath,
             'keyword_score': score,
@@ -222,36 +738,65 @@ def cmd_search_json(query, top_n=10):
         'candidate_count': len(candidates),
         'candidates': candidates,
     }
-    print(json.dumps(output, indent=2))
+    payload = _dumps(output) + b'\n'
+    sys.stdout.write(payload.decode())
+    _write_search_cache(cache_path, payload)
     return output
 
 
-def cmd_miss(query, expected_path, reason=''):
-    """Log a search miss for evaluation."""
+def _migrate_miss_log():
+    """Convert a legacy miss-log.json array into the NDJSON log, once."""
+    if os.path.exists(MISS_LOG_FILE):
+        return
     try:
-        with open(MISS_LOG_FILE, 'r') as f:
-            log = json.load(f)
+        with open(LEGACY_MISS_LOG_FILE, 'rb') as f:
+            log = _loads(f.read())
     except (FileNotFoundError, json.JSONDecodeError):
-        log = []
+        return
+    _atomic_write(MISS_LOG_FILE, b''.join(_dumps(e, indent=False) + b'\n' for e in log))
+    os.remove(LEGACY_MISS_LOG_FILE)
 
-    log.append({
+
+def _read_misses():
+    """Return logged misses in order, skipping torn lines.
+
+    Falls back to a legacy miss-log.json that `miss` has not converted
+    yet, without converting it. Returns None if nothing was ever logged.
+    """
+    try:
+        with open(MISS_LOG_FILE, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        try:
+            with open(LEGACY_MISS_LOG_FILE, 'rb') as f:
+                return _loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+    log = []
+    for line in lines:
+        try:
+            log.append(_loads(line))
+        except json.JSONDecodeError:
+            continue
+    return log
+
+
+def cmd_miss(query, expected_path, reason=''):
+    """Log a search miss for evaluation."""
+    _migrate_miss_log()
+    _append_record(MISS_LOG_FILE, {
         'timestamp': datetime.now(timezone.utc).isoformat(),
         'query': query,
         'expected_path': expected_path,
         'reason': reason,
     })
-    os.makedirs(os.path.dirname(MISS_LOG_FILE), exist_ok=True)
-    with open(MISS_LOG_FILE, 'w') as f:
-        json.dump(log, f, indent=2)
     print(f'Logged miss: query=\'{query}\' expected=\'{expected_path}\'')
 
 
 def cmd_misses():
     """Print the miss log for review."""
-    try:
-        with open(MISS_LOG_FILE, 'r') as f:
-            log = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    log = _read_misses()
+    if not log:
         print('No misses logged yet.')
         return
 
@@ -268,32 +813,203 @@ def cmd_stats():
     """Print index statistics."""
     index = load_index()
     entries = index.get('entries', {})
-    total_files = len(vault_files())
+    files = set(vault_files())
+    total_files = len(files)
     indexed = len(entries)
 
-    all_keywords = set()
+    keyword_counts = Counter()
     for entry in entries.values():
-        all_keywords.update(k.lower() for k in entry.get('keywords', []))
+        keyword_counts.update(k.lower() for k in entry.get('keywords', []))
 
     # Check for stale entries (files that were deleted)
-    stale = [p for p in entries if not os.path.isfile(p)]
+    stale = entries.keys() - files
 
     print(f'Vault files:      {total_files}')
     print(f'Indexed:          {indexed}')
-    print(f'Unique keywords:  {len(all_keywords)}')
+    print(f'Unique keywords:  {len(keyword_counts)}')
     if stale:
         print(f'Stale entries:    {len(stale)} (indexed file no longer exists)')
-    if all_keywords:
-        sample = sorted(all_keywords)[:20]
+    if keyword_counts:
+        # Most widely used keywords first
+        sample = [k for k, _ in keyword_counts.most_common(20)]
         print(f'Sample keywords:  {", ".join(sample)}')
 
     # Miss log stats
-    try:
-        with open(MISS_LOG_FILE, 'r') as f:
-            misses = json.load(f)
+    misses = _read_misses()
+    if misses is not None:
         print(f'Logged misses:    {len(misses)}')
-    except (FileNotFoundError, json.JSONDecodeError):
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+#
+# Frames on the socket are a little-endian uint32 length followed by that
+# many bytes of JSON. The client sends {"argv": [...], "version": ...,
+# "script": ...} and the daemon answers {"code": <exit status>, "stdout":
+# <captured output>}, or {"refused": <reason>} if it runs different code.
+
+# Commands share module state and a redirected sys.stdout, so the daemon
+# runs one at a time.
+_daemon_lock = threading.Lock()
+
+
+def _script_stamp():
+    """mtime_ns of this script, so client and daemon can tell they match."""
+    return os.stat(os.path.abspath(__file__)).st_mtime_ns
+
+
+# Taken at import: a daemon keeps the code it started with even if the
+# script is replaced on disk.
+_SCRIPT_STAMP = _script_stamp()
+
+
+def _send_frame(sock, obj):
+    """Send obj as one length-prefixed JSON frame."""
+    data = _dumps(obj, indent=False)
+    sock.sendall(struct.pack('<I', len(data)) + data)
+
+
+def _recv_exact(sock, n, eof_ok=False):
+    """Read exactly n bytes from sock.
+
+    With eof_ok, a peer that closes before sending anything yields None;
+    closing partway through always raises ConnectionError.
+    """
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            if eof_ok and not buf:
+                return None
+            raise ConnectionError('peer closed the connection mid-frame')
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_frame(sock):
+    """Read one frame from sock, or None if the peer closed cleanly first."""
+    header = _recv_exact(sock, 4, eof_ok=True)
+    if header is None:
+        return None
+    (n,) = struct.unpack('<I', header)
+    return _loads(_recv_exact(sock, n))
+
+
+def _run_captured(argv):
+    """Run a command in-process, returning (exit code, stdout text)."""
+    out = io.StringIO()
+    code = 0
+    with contextlib.redirect_stdout(out):
+        try:
+            main(argv)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            print(traceback.format_exc(), end='')
+            code = 1
+    return code, out.getvalue()
+
+
+class _DaemonHandler(socketserver.BaseRequestHandler):
+    """Run one framed command request and send back its result."""
+
+    def handle(self):
+        """Serve a single request on this connection."""
+        request = _recv_frame(self.request)
+        if request is None:
+            return  # a connect-and-close probe, e.g. from a second `serve`
+        if (request.get('version') != INDEX_VERSION
+                or request.get('script') != _SCRIPT_STAMP):
+            _send_frame(self.request, {'refused': 'index daemon runs a different script version'})
+            # A stale daemon is of no further use; let a current one take over
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        with _daemon_lock:
+            code, out = _run_captured(request['argv'])
+        # Output can hold surrogate-escaped bytes (e.g. non-UTF-8 file
+        # names), which JSON cannot carry; send them as backslash escapes.
+        out = out.encode('utf-8', 'backslashreplace').decode('utf-8')
+        _send_frame(self.request, {'code': code, 'stdout': out})
+
+
+def _connect():
+    """Connect to the daemon socket. Raises OSError if nothing is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(INDEX_SOCKET)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _start_daemon():
+    """Spawn `serve` in the background and wait for it to accept connections."""
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve'],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+    for _ in range(50):
+        time.sleep(0.05)
+        try:
+            return _connect()
+        except OSError:
+            pass
+    return None
+
+
+def _forward(argv):
+    """Run argv on the daemon. Returns its exit code, or None to run locally."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    try:
+        sock = _connect()
+    except OSError:
+        if os.environ.get(DAEMON_ENV) != '1' or not os.path.isdir(VAULT_DIR):
+            return None
+        sock = _start_daemon()
+        if sock is None:
+            return None
+    try:
+        with sock:
+            _send_frame(sock, {'argv': argv, 'version': INDEX_VERSION,
+                               'script': _SCRIPT_STAMP})
+            response = _recv_frame(sock)
+    except (OSError, ValueError):
+        # Connection trouble, or a frame that would not encode or decode
+        return None
+    if response is None or 'refused' in response:
+        return None
+    sys.stdout.write(response['stdout'])
+    return response['code']
+
+
+def cmd_serve():
+    """Hold the index in memory and run commands sent over INDEX_SOCKET."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print('Error: serve requires Unix domain sockets')
+        sys.exit(1)
+    os.makedirs(os.path.dirname(INDEX_SOCKET), exist_ok=True)
+    if os.path.exists(INDEX_SOCKET):
+        try:
+            _connect().close()
+        except OSError:
+            os.remove(INDEX_SOCKET)  # left behind by a daemon that died
+        else:
+            print(f'Error: index daemon already running on {INDEX_SOCKET}')
+            sys.exit(1)
+    server = socketserver.ThreadingUnixStreamServer(INDEX_SOCKET, _DaemonHandler)
+    # The daemon reads and writes files for whoever connects; owner only
+    os.chmod(INDEX_SOCKET, 0o600)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f'Serving index on {INDEX_SOCKET}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
         pass
+    finally:
+        server.server_close()
+        os.remove(INDEX_SOCKET)
 
 
 # ---------------------------------------------------------------------------
@@ -312,51 +1028,68 @@ Commands:
   miss <query> <expected> [reason]  Log a search miss
   misses                            Show miss log
   stats                             Show index statistics
+  compact                           Fold journaled updates into the index
+  serve                             Run commands from a resident daemon
 """
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
+
+def main(argv):
+    """Dispatch a command line (without the program name)."""
+    if not argv:
         print(USAGE)
         sys.exit(1)
 
-    cmd = sys.argv[1]
+    cmd = argv[0]
 
     if cmd == 'scan':
         cmd_scan()
     elif cmd == 'file':
-        if len(sys.argv) < 3:
+        if len(argv) < 2:
             print('Usage: index-vault.py file <path>')
             sys.exit(1)
-        cmd_file(sys.argv[2])
+        cmd_file(argv[1])
     elif cmd == 'search':
-        if len(sys.argv) < 3:
+        if len(argv) < 2:
             print('Usage: index-vault.py search <query>')
             sys.exit(1)
-        cmd_search(' '.join(sys.argv[2:]))
+        cmd_search(' '.join(argv[1:]))
     elif cmd == 'search-json':
-        if len(sys.argv) < 3:
+        if len(argv) < 2:
             print('Usage: index-vault.py search-json <query>')
             sys.exit(1)
-        cmd_search_json(' '.join(sys.argv[2:]))
+        cmd_search_json(' '.join(argv[1:]))
     elif cmd == 'update':
-        if len(sys.argv) < 5:
+        if len(argv) < 4:
             print('Usage: index-vault.py update <path> <summary> <keywords-csv> [related-csv]')
             sys.exit(1)
-        fpath = sys.argv[2]
-        summary = sys.argv[3]
-        keywords = [k.strip() for k in sys.argv[4].split(',')]
-        related = [r.strip() for r in sys.argv[5].split(',')] if len(sys.argv) > 5 else []
+        fpath = argv[1]
+        summary = argv[2]
+        keywords = [k.strip() for k in argv[3].split(',')]
+        related = [r.strip() for r in argv[4].split(',')] if len(argv) > 4 else []
         cmd_update(fpath, summary, keywords, related)
     elif cmd == 'miss':
-        if len(sys.argv) < 4:
+        if len(argv) < 3:
             print('Usage: index-vault.py miss <query> <expected-path> [reason]')
             sys.exit(1)
-        cmd_miss(sys.argv[2], sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else '')
+        cmd_miss(argv[1], argv[2], argv[3] if len(argv) > 3 else '')
     elif cmd == 'misses':
         cmd_misses()
     elif cmd == 'stats':
         cmd_stats()
+    elif cmd == 'compact':
+        cmd_compact()
+    elif cmd == 'serve':
+        cmd_serve()
     else:
         print(f'Unknown command: {cmd}')
         print(USAGE)
         sys.exit(1)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args and args[0] != 'serve':
+        code = _forward(args)
+        if code is not None:
+            sys.exit(code)
+    main(args)